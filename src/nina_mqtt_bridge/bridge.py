@@ -2,21 +2,26 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import queue
 import threading
+import time
+from collections import deque
+from dataclasses import dataclass
 from functools import partial
-from typing import Optional
+from typing import Any, Callable, Optional
+
+import orjson
 
 from .config import BridgeConfig
-from .device_model import DEVICE_SENSORS, extract_state_values
+from .device_model import DEVICE_SENSORS, clear_state_cache, extract_state_values
 from .discovery import (
     IMAGE_DEVICES,
     IMAGE_TOPIC_TEMPLATE,
     STATE_TOPIC_TEMPLATE,
     build_image_discovery_message,
     build_sensor_discovery_messages,
+    expire_after_seconds,
 )
 from .mqtt_client import MQTTClient, PublishMessage
 from .nina_client import DEVICE_ENDPOINTS, IMAGE_ENDPOINTS, NINAClient
@@ -24,6 +29,55 @@ from .scheduler import ScheduledTask, Scheduler
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on messages drained from the publish queue per publisher wakeup.
+PUBLISH_BATCH_SIZE = 256
+
+# Unchanged state values are skipped, but every value is republished when the
+# next poll could land after Home Assistant's expire_after. The next poll is
+# expected within the largest of the last POLL_GAP_WINDOW gaps between a
+# device's polls (which includes time queued behind other devices), padded by
+# REPUBLISH_SLACK.
+POLL_GAP_WINDOW = 10
+REPUBLISH_SLACK = 0.1
+
+# Frozen membership sets for the device-type checks made on every poll.
+_IMAGE_ENDPOINT_NAMES = frozenset(IMAGE_ENDPOINTS)
+_POLLED_DEVICE_NAMES = frozenset(DEVICE_ENDPOINTS)
+_SENSOR_DEVICE_NAMES = frozenset(DEVICE_SENSORS)
+_DISCOVERY_IMAGE_NAMES = frozenset(IMAGE_DEVICES)
+
+_TRUE = b"true"
+_FALSE = b"false"
+
+
+def _format_fallback(value: object) -> bytes:
+    return str(value).encode("utf-8")
+
+
+# State payloads are encoded once here so paho does not have to; dispatch is on
+# the exact type so bool is not mistaken for int. Numbers use the fallback.
+_VALUE_FORMATTERS: dict[type, Callable[[Any], bytes]] = {
+    bytes: lambda value: value,
+    bool: lambda value: _TRUE if value else _FALSE,
+    str: lambda value: value.encode("utf-8"),
+}
+
+
+@dataclass(frozen=True)
+class DeviceTopics:
+    """MQTT topics for a single device, rendered once from the templates."""
+
+    availability: str
+    image: str
+    command_error: str
+    state_prefix: str
+    # Availability messages never change, so they are built once and reused.
+    online: PublishMessage
+    offline: PublishMessage
+
+    def state(self, variable: str) -> str:
+        return self.state_prefix + variable
+
 
 class Bridge:
     """Coordinates NINA polling and MQTT publishing."""
@@ -34,10 +88,25 @@ class Bridge:
         self.mqtt = MQTTClient(config.mqtt)
         self.scheduler = Scheduler()
         self.image_scheduler = Scheduler()
-        self._publish_queue: queue.Queue[PublishMessage] = queue.Queue()
+        # Each queue item is a batch so producers pay one put per batch.
+        self._publish_queue: queue.SimpleQueue[list[PublishMessage]] = (
+            queue.SimpleQueue()
+        )
         self._stop_event = threading.Event()
+        # Serializes direct poll publishes against shutdown's OFF publish.
+        self._direct_publish_lock = threading.Lock()
         self._publisher_thread: Optional[threading.Thread] = None
         self._published_discovery_topics: set[str] = set()
+        # Variables already covered by discovery, per polled device.
+        self._discovered_keys: dict[str, frozenset[str]] = {}
+        self._last_state: dict[tuple[str, str], bytes] = {}
+        self._last_full_publish: dict[str, float] = {}
+        self._last_poll_at: dict[str, float] = {}
+        self._poll_gaps: dict[str, deque[float]] = {}
+        self._bridge_availability_topic = config.mqtt.topics.render_availability_topic()
+        self._topics: dict[str, DeviceTopics] = {
+            device: self._render_device_topics(device) for device in config.devices
+        }
 
     def start(self) -> None:
         self._configure_mqtt()
@@ -53,17 +122,21 @@ class Bridge:
         # Stop scheduling new work but allow publisher to drain queued messages.
         self.scheduler.stop()
         self.image_scheduler.stop()
-        self._publish_all_device_availability("OFF")
-        self._publish_availability("OFF")
-        self._stop_event.set()
+        # A poll can outlive the scheduler join; once this is set it can no
+        # longer publish, so it cannot overwrite the OFF sent below.
+        with self._direct_publish_lock:
+            self._stop_event.set()
         if self._publisher_thread:
             self._publisher_thread.join(timeout=5)
+        # Publish availability OFF directly once the queue is drained so no
+        # stale ON can overtake it.
+        self.mqtt.publish_retained_bulk(self._availability_payloads("OFF"))
         self.mqtt.disconnect()
         self.nina.close()
+        clear_state_cache()
 
     def _configure_mqtt(self) -> None:
-        availability_topic = self.config.mqtt.topics.render_availability_topic()
-        self.mqtt.set_lwt(availability_topic, payload="OFF")
+        self.mqtt.set_lwt(self._bridge_availability_topic, payload="OFF")
         self.mqtt.connect()
         self._publish_availability("ON")
 
@@ -77,39 +150,38 @@ class Bridge:
 
     def _handle_command(self, _client, msg) -> None:
         try:
-            payload = json.loads(msg.payload.decode("utf-8") or "{}")
-        except json.JSONDecodeError:
+            payload = orjson.loads(msg.payload) if msg.payload else {}
+        except orjson.JSONDecodeError:
             logger.warning("Invalid command payload on %s", msg.topic)
             return
         parts = msg.topic.split("/")
         device = parts[-2] if len(parts) >= 2 else "unknown"
         logger.info("Received command for %s: %s", device, payload)
+        topics = self._device_topics(device)
         try:
             response = self.nina.send_command(device, payload)
             if response:
-                state_topic = STATE_TOPIC_TEMPLATE.format(
-                    base=self.config.mqtt.topics.base_topic,
-                    device=device,
-                    variable="command_response",
-                )
                 self._publish_queue.put(
-                    PublishMessage(
-                        topic=state_topic,
-                        payload=json.dumps(response),
-                        retain=False,
-                        qos=0,
-                    )
+                    [
+                        PublishMessage(
+                            topic=topics.state("command_response"),
+                            payload=orjson.dumps(response),
+                            retain=False,
+                            qos=0,
+                        )
+                    ]
                 )
         except Exception as exc:  # pragma: no cover - logs capture issue
             logger.exception("Command handling failed for %s", device)
-            error_topic = self.config.mqtt.topics.render_command_error_topic(device)
             self._publish_queue.put(
-                PublishMessage(
-                    topic=error_topic,
-                    payload=str(exc),
-                    retain=False,
-                    qos=0,
-                )
+                [
+                    PublishMessage(
+                        topic=topics.command_error,
+                        payload=str(exc),
+                        retain=False,
+                        qos=0,
+                    )
+                ]
             )
 
     def _start_publisher(self) -> None:
@@ -123,12 +195,17 @@ class Bridge:
             if not device_cfg.enabled:
                 logger.info("Device %s disabled; skipping", device_name)
                 continue
-            if self._is_image_device(device_name):
+            # Resolve the device kind once so the poll callbacks need no guards.
+            topics = self._topics[device_name]
+            if device_name in _IMAGE_ENDPOINT_NAMES:
                 scheduler = self.image_scheduler
-                task_fn = partial(self._poll_image, device_name)
-            else:
+                task_fn = partial(self._poll_image, device_name, topics)
+            elif device_name in _POLLED_DEVICE_NAMES:
                 scheduler = self.scheduler
-                task_fn = partial(self._poll_device, device_name)
+                task_fn = partial(self._poll_device, device_name, topics)
+            else:
+                logger.debug("Skipping unsupported device %s", device_name)
+                continue
             scheduler.add_task(
                 ScheduledTask(
                     name=f"poll_{device_name}",
@@ -137,97 +214,156 @@ class Bridge:
                 )
             )
 
-    @staticmethod
-    def _is_image_device(device_name: str) -> bool:
-        return device_name in IMAGE_ENDPOINTS or device_name in IMAGE_DEVICES
+    def _render_device_topics(self, device: str) -> DeviceTopics:
+        topics = self.config.mqtt.topics
+        base = topics.base_topic
+        availability = topics.render_device_availability_topic(device)
+        return DeviceTopics(
+            availability=availability,
+            image=IMAGE_TOPIC_TEMPLATE.format(base=base, device=device),
+            command_error=topics.render_command_error_topic(device),
+            state_prefix=STATE_TOPIC_TEMPLATE.format(
+                base=base, device=device, variable=""
+            ),
+            online=PublishMessage(topic=availability, payload="ON", retain=True, qos=1),
+            offline=PublishMessage(
+                topic=availability, payload="OFF", retain=True, qos=1
+            ),
+        )
 
-    def _poll_device(self, device: str) -> None:
-        if device not in DEVICE_ENDPOINTS:
-            logger.debug("Skipping unsupported device %s", device)
-            return
+    def _device_topics(self, device: str) -> DeviceTopics:
+        # Commands may name devices outside the configured set.
+        topics = self._topics.get(device)
+        if topics is None:
+            topics = self._render_device_topics(device)
+        return topics
 
-        availability_topic = self.config.mqtt.topics.render_device_availability_topic(
-            device
-        )
+    def _poll_device(self, device: str, topics: DeviceTopics) -> None:
         try:
-            logger.debug("Polling device status: %s", device)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Polling device status: %s", device)
             status = self.nina.fetch_device_status(device)
             values = extract_state_values(device, status)
 
             # Publish dynamic discovery (e.g., switch channels) when first seen.
-            self._publish_device_discovery(device, extra_keys=values.keys())
+            known_keys = self._discovered_keys.get(device)
+            if known_keys is None or not values.keys() <= known_keys:
+                self._publish_device_discovery(device, extra_keys=values.keys())
+                self._discovered_keys[device] = frozenset(values).union(
+                    known_keys or ()
+                )
 
-            base_topic = self.config.mqtt.topics.base_topic
+            now = time.monotonic()
+            publish_all = self._full_publish_due(device, now)
+            messages: list[PublishMessage] = []
             for variable, value in values.items():
                 if value is None:
                     continue
-                topic = STATE_TOPIC_TEMPLATE.format(
-                    base=base_topic, device=device, variable=variable
-                )
-                self._publish_queue.put(
+                payload = self._format_value(value)
+                key = (device, variable)
+                if not publish_all and self._last_state.get(key) == payload:
+                    continue
+                self._last_state[key] = payload
+                messages.append(
                     PublishMessage(
-                        topic=topic,
-                        payload=self._format_value(value),
+                        topic=topics.state(variable),
+                        payload=payload,
                         retain=True,
                         qos=0,
                     )
                 )
+            if publish_all:
+                self._last_full_publish[device] = now
 
-            self._publish_queue.put(
-                PublishMessage(
-                    topic=availability_topic, payload="ON", retain=True, qos=1
-                )
-            )
+            messages.append(topics.online)
+            # paho is thread-safe and runs its own network thread, so poll
+            # results skip the publish queue and its extra thread hop.
+            self._publish_direct(messages)
         except Exception:
             logger.exception("Polling device %s failed", device)
-            self._publish_queue.put(
-                PublishMessage(
-                    topic=availability_topic, payload="OFF", retain=True, qos=1
-                )
-            )
+            self._forget_state(device)
+            self._publish_direct([topics.offline])
 
-    def _poll_image(self, image_type: str) -> None:
-        if image_type not in IMAGE_ENDPOINTS:
-            logger.debug("Skipping unsupported image type %s", image_type)
-            return
-        logger.debug("Polling image: %s", image_type)
+    def _full_publish_due(self, device: str, now: float) -> bool:
+        gaps = self._poll_gaps.get(device)
+        if gaps is None:
+            gaps = self._poll_gaps[device] = deque(maxlen=POLL_GAP_WINDOW)
+        previous = self._last_poll_at.get(device)
+        self._last_poll_at[device] = now
+        if previous is not None:
+            gaps.append(now - previous)
+
+        last = self._last_full_publish.get(device)
+        if last is None or not gaps:
+            return True
+        expire_after = expire_after_seconds(self.config.devices[device].refresh_every)
+        if not expire_after:
+            return False
+        next_gap = max(gaps) * (1 + REPUBLISH_SLACK)
+        return now - last + next_gap >= expire_after
+
+    def _forget_state(self, device: str) -> None:
+        """Drop cached values so the next successful poll publishes everything."""
+        self._last_full_publish.pop(device, None)
+        # The gap across a failed poll says nothing about normal cadence.
+        self._last_poll_at.pop(device, None)
+        for key in [key for key in self._last_state if key[0] == device]:
+            del self._last_state[key]
+
+    def _poll_image(self, image_type: str, topics: DeviceTopics) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Polling image: %s", image_type)
         image_bytes = self.nina.fetch_image(image_type)
-        availability_topic = self.config.mqtt.topics.render_device_availability_topic(
-            image_type
-        )
         if image_bytes is None:
-            self._publish_queue.put(
-                PublishMessage(
-                    topic=availability_topic, payload="OFF", retain=True, qos=1
-                )
-            )
+            self._publish_direct([topics.offline])
             return
 
-        topic = IMAGE_TOPIC_TEMPLATE.format(
-            base=self.config.mqtt.topics.base_topic, device=image_type
-        )
-        self._publish_queue.put(
-            PublishMessage(topic=topic, payload=image_bytes, retain=False, qos=0)
-        )
-        self._publish_queue.put(
-            PublishMessage(topic=availability_topic, payload="ON", retain=True, qos=1)
+        self._publish_direct(
+            [
+                PublishMessage(
+                    topic=topics.image, payload=image_bytes, retain=False, qos=0
+                ),
+                topics.online,
+            ]
         )
 
+    def _publish_direct(self, messages: list[PublishMessage]) -> None:
+        """Publish from a poll thread unless shutdown has started."""
+        with self._direct_publish_lock:
+            if self._stop_event.is_set():
+                return
+            self.mqtt.publish_many(messages)
+
     def _publisher_loop(self) -> None:
-        while not self._stop_event.is_set() or not self._publish_queue.empty():
+        # Bind hot-path lookups once; this loop runs for every published message.
+        stop_is_set = self._stop_event.is_set
+        queue_empty = self._publish_queue.empty
+        queue_get = self._publish_queue.get
+        queue_get_nowait = self._publish_queue.get_nowait
+        publish_many = self.mqtt.publish_many
+        while not stop_is_set() or not queue_empty():
             try:
-                message = self._publish_queue.get(timeout=0.5)
+                messages = queue_get(timeout=0.5)
             except queue.Empty:
                 continue
-            try:
-                self.mqtt.publish(message)
-            except Exception:
-                logger.exception("MQTT publish failed for %s", message.topic)
+            batch = list(messages)
+            while len(batch) < PUBLISH_BATCH_SIZE:
+                try:
+                    batch.extend(queue_get_nowait())
+                except queue.Empty:
+                    break
+            publish_many(batch)
 
     def _publish_availability(self, payload: str) -> None:
-        topic = self.config.mqtt.topics.render_availability_topic()
         self._publish_queue.put(
-            PublishMessage(topic=topic, payload=payload, retain=True, qos=1)
+            [
+                PublishMessage(
+                    topic=self._bridge_availability_topic,
+                    payload=payload,
+                    retain=True,
+                    qos=1,
+                )
+            ]
         )
 
     def _publish_discovery(self) -> None:
@@ -239,9 +375,9 @@ class Bridge:
     def _publish_device_discovery(self, device: str, extra_keys=None) -> None:
         extra_keys = list(extra_keys or [])
         messages = []
-        if device in IMAGE_DEVICES:
+        if device in _DISCOVERY_IMAGE_NAMES:
             messages.append(build_image_discovery_message(self.config, device))
-        elif device in DEVICE_SENSORS:
+        elif device in _SENSOR_DEVICE_NAMES:
             refresh = (
                 self.config.devices.get(device).refresh_every
                 if device in self.config.devices
@@ -258,27 +394,25 @@ class Bridge:
         else:
             return
 
+        new_messages = []
         for msg in messages:
             if msg.topic in self._published_discovery_topics:
                 continue
             self._published_discovery_topics.add(msg.topic)
-            self._publish_queue.put(msg)
+            new_messages.append(msg)
+        if new_messages:
+            self._publish_queue.put(new_messages)
 
-    def _publish_all_device_availability(self, payload: str) -> None:
-        for device_name, device_cfg in self.config.devices.items():
-            if not device_cfg.enabled:
-                continue
-            topic = self.config.mqtt.topics.render_device_availability_topic(
-                device_name
-            )
-            self._publish_queue.put(
-                PublishMessage(topic=topic, payload=payload, retain=True, qos=1)
-            )
+    def _availability_payloads(self, payload: str) -> list[tuple[str, str]]:
+        payloads = [
+            (self._topics[device_name].availability, payload)
+            for device_name, device_cfg in self.config.devices.items()
+            if device_cfg.enabled
+        ]
+        payloads.append((self._bridge_availability_topic, payload))
+        return payloads
 
     @staticmethod
-    def _format_value(value: object) -> str | bytes:
-        if isinstance(value, bytes):
-            return value
-        if isinstance(value, bool):
-            return "true" if value else "false"
-        return str(value)
+    def _format_value(value: object) -> bytes:
+        formatter = _VALUE_FORMATTERS.get(type(value), _format_fallback)
+        return formatter(value)
@@ -8,6 +8,11 @@ from typing import Any, Dict, Optional
 
 import yaml
 
+try:  # Prefer the libyaml-backed loader when PyYAML was built with it.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on PyYAML build
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 # Defaults taken from PROJECT.md
 DEFAULT_NINA_API_URI = "http://127.0.0.1:1888/v2/api"
 
@@ -53,7 +58,7 @@ DEFAULT_DEVICE_TYPES = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceConfig:
     """Polling configuration for a given NINA device class."""
 
@@ -61,14 +66,14 @@ class DeviceConfig:
     refresh_every: int = DEFAULT_REFRESH_SECONDS
 
 
-@dataclass
+@dataclass(slots=True)
 class NINAConfig:
     """Connection settings for the NINA Advanced API."""
 
     api_uri: str = DEFAULT_NINA_API_URI
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MQTTTopicConfig:
     """MQTT topic templates and timing."""
 
@@ -79,21 +84,25 @@ class MQTTTopicConfig:
     command_error_topic: str = DEFAULT_COMMAND_ERROR_TOPIC_TEMPLATE
     command_response_timeout: int = DEFAULT_COMMAND_RESPONSE_TIMEOUT
 
+    def _render(self, template: str, device: str) -> str:
+        # Not memoized: command topics can name arbitrary devices, and the
+        # bridge already keeps rendered topics for configured ones.
+        return template.format(base=self.base_topic, device=device)
+
     def render_availability_topic(self, device: str | None = None) -> str:
-        device_slug = device or "bridge"
-        return self.availability_topic.format(base=self.base_topic, device=device_slug)
+        return self._render(self.availability_topic, device or "bridge")
 
     def render_device_availability_topic(self, device: str) -> str:
         return self.render_availability_topic(device=device)
 
     def render_command_topic(self, device: str) -> str:
-        return self.command_topic.format(base=self.base_topic, device=device)
+        return self._render(self.command_topic, device)
 
     def render_command_error_topic(self, device: str) -> str:
-        return self.command_error_topic.format(base=self.base_topic, device=device)
+        return self._render(self.command_error_topic, device)
 
 
-@dataclass
+@dataclass(slots=True)
 class MQTTConfig:
     """Connection settings for MQTT."""
 
@@ -106,7 +115,7 @@ class MQTTConfig:
     topics: MQTTTopicConfig = field(default_factory=MQTTTopicConfig)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DeviceInfo:
     """Home Assistant device metadata."""
 
@@ -116,7 +125,7 @@ class DeviceInfo:
     model: str = DEFAULT_DEVICE_MODEL
 
 
-@dataclass
+@dataclass(slots=True)
 class BridgeConfig:
     """Top-level configuration object."""
 
@@ -128,7 +137,7 @@ class BridgeConfig:
 
 def _load_yaml(path: Path) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle) or {}
+        return yaml.load(handle, Loader=_YamlLoader) or {}
 
 
 def _build_devices(config: Dict[str, Any]) -> Dict[str, DeviceConfig]:
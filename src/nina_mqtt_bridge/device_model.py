@@ -3,16 +3,28 @@
 from __future__ import annotations
 
 import dataclasses
-from typing import Any, Dict, List, Optional
+import functools
+import re
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import orjson
 
 from .config import DeviceInfo
 
+# Matches every ASCII character that is not a lowercase letter or digit.
+_STRIP_RE = re.compile(r"[^a-z0-9]")
+
 
+@functools.lru_cache(maxsize=4096)
 def _normalize(key: str) -> str:
+    # NINA keys come from a small closed set, so results are memoized.
+    if key.isascii():
+        return _STRIP_RE.sub("", key.lower())
     return "".join(ch for ch in key.lower() if ch.isalnum())
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class SensorDef:
     name: Optional[str] = None
     unit: Optional[str] = None
@@ -23,7 +35,7 @@ class SensorDef:
     platform: str = "sensor"  # sensor or binary_sensor
 
 
-DEVICE_SENSORS: Dict[str, Dict[str, SensorDef]] = {
+_DEVICE_SENSORS: Dict[str, Dict[str, SensorDef]] = {
     "application": {
         "nina_version": SensorDef(name="NINA Version", icon="mdi:alpha-n-box"),
         "api_version": SensorDef(name="API Version", icon="mdi:api"),
@@ -404,7 +416,7 @@ DEVICE_SENSORS: Dict[str, Dict[str, SensorDef]] = {
         ),
         "name": SensorDef(name="Switch Name", icon="mdi:toggle-switch"),
         "displayname": SensorDef(name="Switch Display Name", icon="mdi:label"),
-        # Dynamic switch entries are appended at runtime.
+        # Dynamic switch entries are discovered at runtime (see discovery.py).
     },
     "weather": {
         "cloudcover": SensorDef(
@@ -497,43 +509,86 @@ DEVICE_SENSORS: Dict[str, Dict[str, SensorDef]] = {
     },
 }
 
+# Read-only view of the sensor table; derived plans and memoized discovery
+# messages rely on it never changing at runtime.
+DEVICE_SENSORS: Mapping[str, Mapping[str, SensorDef]] = MappingProxyType(
+    {
+        device: MappingProxyType(definitions)
+        for device, definitions in _DEVICE_SENSORS.items()
+    }
+)
+
+# Per device, each variable with its already-normalized lookup candidates
+# (source aliases first, then the variable name itself).
+_RESOLUTION_PLAN: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {
+    device: [
+        (
+            var,
+            tuple(
+                _normalize(candidate) for candidate in (definition.source or []) + [var]
+            ),
+        )
+        for var, definition in definitions.items()
+    ]
+    for device, definitions in DEVICE_SENSORS.items()
+}
+
+_MISSING = object()
+
 
 def _build_lookup(status: Dict[str, Any]) -> Dict[str, Any]:
+    norm = _normalize
     lookup: Dict[str, Any] = {}
+    put = lookup.__setitem__
     for key, value in status.items():
-        if key == "Response" and isinstance(value, dict):
+        if isinstance(value, dict):
+            # Normalized keys are alphanumeric only, so "Outer_Inner" can be
+            # built by concatenating the already-normalized parts.
+            prefix = "" if key == "Response" else norm(key)
             for inner_key, inner_val in value.items():
-                lookup[_normalize(inner_key)] = inner_val
-        elif isinstance(value, dict):
-            for inner_key, inner_val in value.items():
-                lookup[_normalize(f"{key}_{inner_key}")] = inner_val
+                put(prefix + norm(inner_key), inner_val)
         else:
-            lookup[_normalize(key)] = value
+            put(norm(key), value)
     return lookup
 
 
+# (API field, variable template) pairs unrolled for each switch entry.
+_READONLY_SWITCH_FIELDS = (
+    ("Name", "readonly_switch_{}_name"),
+    ("Value", "readonly_switch_{}_value"),
+    ("Id", "readonly_switch_{}_id"),
+    ("Description", "readonly_switch_{}_description"),
+)
+_WRITABLE_SWITCH_FIELDS = (
+    ("Name", "writable_switch_{}_name"),
+    ("Id", "writable_switch_{}_id"),
+    ("Min", "writable_switch_{}_min"),
+    ("Max", "writable_switch_{}_max"),
+    ("Description", "writable_switch_{}_description"),
+    ("StepSize", "writable_switch_{}_stepsize"),
+    ("TargetValue", "writable_switch_{}_targetvalue"),
+)
+
+
+def _append_switch_entries(
+    entries: List[Any], fields: Tuple[Tuple[str, str], ...], values: Dict[str, Any]
+) -> None:
+    for idx, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        for source, template in fields:
+            value = entry.get(source)
+            if value is not None:
+                values[template.format(idx)] = value
+
+
 def _append_switches(status: Dict[str, Any], values: Dict[str, Any]) -> None:
     resp = status.get("Response", {}) if isinstance(status, dict) else {}
     ro_list = resp.get("ReadonlySwitches", []) or []
-    for idx, entry in enumerate(ro_list):
-        if not isinstance(entry, dict):
-            continue
-        values[f"readonly_switch_{idx}_name"] = entry.get("Name")
-        values[f"readonly_switch_{idx}_value"] = entry.get("Value")
-        values[f"readonly_switch_{idx}_id"] = entry.get("Id")
-        values[f"readonly_switch_{idx}_description"] = entry.get("Description")
+    _append_switch_entries(ro_list, _READONLY_SWITCH_FIELDS, values)
 
     rw_list = resp.get("WriteableSwitches", []) or []
-    for idx, entry in enumerate(rw_list):
-        if not isinstance(entry, dict):
-            continue
-        values[f"writable_switch_{idx}_name"] = entry.get("Name")
-        values[f"writable_switch_{idx}_id"] = entry.get("Id")
-        values[f"writable_switch_{idx}_min"] = entry.get("Min")
-        values[f"writable_switch_{idx}_max"] = entry.get("Max")
-        values[f"writable_switch_{idx}_description"] = entry.get("Description")
-        values[f"writable_switch_{idx}_stepsize"] = entry.get("StepSize")
-        values[f"writable_switch_{idx}_targetvalue"] = entry.get("TargetValue")
+    _append_switch_entries(rw_list, _WRITABLE_SWITCH_FIELDS, values)
 
 
 def _append_filterwheel(status: Dict[str, Any], values: Dict[str, Any]) -> None:
@@ -546,11 +601,31 @@ def _append_filterwheel(status: Dict[str, Any], values: Dict[str, Any]) -> None:
             values["selected_filter_id"] = selected.get("Id")
 
 
-def extract_state_values(device: str, status: Dict[str, Any]) -> Dict[str, Any]:
+def extract_state_values(device: str, status: Dict[str, Any]) -> Mapping[str, Any]:
     """
-    Flatten API responses into a dictionary of requested variables.
+    Flatten API responses into a read-only mapping of requested variables.
+
+    NINA often returns identical payloads between polls, so results are
+    memoized on the canonical (sorted-key) JSON encoding of the status.
     """
 
+    if device not in DEVICE_SENSORS:
+        return MappingProxyType({})
+    canonical = orjson.dumps(status or {}, option=orjson.OPT_SORT_KEYS)
+    return _extract_state_values_cached(device, canonical)
+
+
+def clear_state_cache() -> None:
+    """Drop memoized extract_state_values results."""
+    _extract_state_values_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def _extract_state_values_cached(device: str, canonical: bytes) -> Mapping[str, Any]:
+    return MappingProxyType(_extract_state_values(device, orjson.loads(canonical)))
+
+
+def _extract_state_values(device: str, status: Dict[str, Any]) -> Dict[str, Any]:
     values: Dict[str, Any] = {}
     if device not in DEVICE_SENSORS:
         return values
@@ -562,13 +637,15 @@ def extract_state_values(device: str, status: Dict[str, Any]) -> Dict[str, Any]:
 
     lookup = _build_lookup(status or {})
 
-    for var, definition in DEVICE_SENSORS.get(device, {}).items():
+    for var, candidates in _RESOLUTION_PLAN[device]:
         if var in values:
             continue
-        for candidate in (definition.source or []) + [var]:
-            norm = _normalize(candidate)
-            if norm in lookup:
-                values[var] = lookup.get(norm)
+        for norm in candidates:
+            value = lookup.get(norm, _MISSING)
+            if value is not _MISSING:
+                # Fields NINA reports as null carry no state worth publishing.
+                if value is not None:
+                    values[var] = value
                 break
 
     return values
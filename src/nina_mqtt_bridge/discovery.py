@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-import json
-from typing import Iterable, List, Tuple
+import functools
+from typing import Dict, Iterable, List, Tuple
 
-from .config import BridgeConfig
+import orjson
+
+from .config import BridgeConfig, DeviceInfo, MQTTTopicConfig
 from .device_model import (
     DEVICE_SENSORS,
     SensorDef,
@@ -19,23 +21,44 @@ IMAGE_TOPIC_TEMPLATE = "{base}/{device}/image"
 
 IMAGE_DEVICES = {"livestack", "most_recent_image", "screenshot"}
 
+# Sensors expire in Home Assistant after this many refresh intervals.
+EXPIRE_AFTER_FACTOR = 2.2
 
-def _iter_sensor_definitions(
-    device: str, extra_keys: Iterable[str] | None = None
-) -> Iterable[Tuple[str, SensorDef]]:
-    base_defs = DEVICE_SENSORS.get(device, {})
-    for key, definition in base_defs.items():
-        yield key, definition
+_BINARY_SENSOR_EXTRAS = {"payload_on": "true", "payload_off": "false"}
+
+
+def expire_after_seconds(refresh_every: int) -> int:
+    """Home Assistant expire_after for a device polled every refresh_every s."""
+    return int(refresh_every * EXPIRE_AFTER_FACTOR) if refresh_every > 0 else 0
 
-    for key in extra_keys or []:
+
+# Static (variable, definition) pairs per device, materialized once.
+_BASE_DEFINITIONS: Dict[str, List[Tuple[str, SensorDef]]] = {
+    device: list(definitions.items()) for device, definitions in DEVICE_SENSORS.items()
+}
+
+
+def _sensor_definitions(
+    device: str, extra_keys: Iterable[str] | None = None
+) -> List[Tuple[str, SensorDef]]:
+    definitions = list(_BASE_DEFINITIONS.get(device, ()))
+    # Only switch channels are discovered dynamically; other devices' extra
+    # keys are always covered by their static definitions.
+    if device != "switch" or not extra_keys:
+        return definitions
+
+    base_defs = DEVICE_SENSORS[device]
+    for key in extra_keys:
         if key in base_defs:
             continue
         # Generic definition for dynamic switch fields.
-        if device == "switch":
-            yield (
+        definitions.append(
+            (
                 key,
                 SensorDef(name=key.replace("_", " ").title(), icon="mdi:toggle-switch"),
             )
+        )
+    return definitions
 
 
 def build_sensor_discovery_messages(
@@ -43,57 +66,88 @@ def build_sensor_discovery_messages(
     device: str,
     refresh_every: int,
     extra_keys: Iterable[str] | None = None,
-) -> List[PublishMessage]:
+) -> Tuple[PublishMessage, ...]:
+    """
+    Build discovery messages for every sensor of a device.
+
+    The inputs are static for the bridge lifetime, so results are memoized and
+    returned as an immutable tuple.
+    """
+
+    return _build_sensor_discovery_cached(
+        config.mqtt.topics,
+        config.device_info,
+        device,
+        refresh_every,
+        tuple(extra_keys or ()),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _build_sensor_discovery_cached(
+    topics: MQTTTopicConfig,
+    device_info: DeviceInfo,
+    device: str,
+    refresh_every: int,
+    extra_keys: Tuple[str, ...],
+) -> Tuple[PublishMessage, ...]:
     messages: List[PublishMessage] = []
-    topics = config.mqtt.topics
     base = topics.base_topic
     discovery_prefix = topics.discovery_prefix.rstrip("/")
-    device_id = device_identifier(config.device_info, device)
-    device_info_payload = device_payload(config.device_info, device)
+    device_id = device_identifier(device_info, device)
+    device_info_payload = device_payload(device_info, device)
     availability_topic = topics.render_device_availability_topic(device)
-
-    for variable, definition in _iter_sensor_definitions(device, extra_keys):
-        platform = (
-            "binary_sensor" if definition.platform == "binary_sensor" else "sensor"
-        )
-        discovery_topic = f"{discovery_prefix}/{platform}/{device_id}/{variable}/config"
-        state_topic = STATE_TOPIC_TEMPLATE.format(
-            base=base, device=device, variable=variable
-        )
-
+    # Loop-invariant topic prefixes; each sensor only appends its variable.
+    state_prefix = STATE_TOPIC_TEMPLATE.format(base=base, device=device, variable="")
+    sensor_prefix = f"{discovery_prefix}/sensor/{device_id}/"
+    binary_sensor_prefix = f"{discovery_prefix}/binary_sensor/{device_id}/"
+    # Keys shared by every sensor of this device, merged into each payload.
+    common = {
+        "availability_topic": availability_topic,
+        "payload_available": "ON",
+        "payload_not_available": "OFF",
+        "device": device_info_payload,
+    }
+    expire_after = expire_after_seconds(refresh_every)
+    expiry = {"expire_after": expire_after} if expire_after else {}
+
+    for variable, definition in _sensor_definitions(device, extra_keys):
+        if definition.platform == "binary_sensor":
+            discovery_topic = binary_sensor_prefix + variable + "/config"
+            platform_extras = _BINARY_SENSOR_EXTRAS
+        else:
+            discovery_topic = sensor_prefix + variable + "/config"
+            platform_extras = {}
+        state_topic = state_prefix + variable
+
+        optional = {
+            key: value
+            for key, value in (
+                ("unit_of_measurement", definition.unit),
+                ("device_class", definition.device_class),
+                ("state_class", definition.state_class),
+                ("icon", definition.icon),
+            )
+            if value
+        }
         payload = {
             "name": definition.name
             or f"{device.title()} {variable.replace('_', ' ').title()}",
             "state_topic": state_topic,
             "unique_id": f"{device_id}_{variable}",
-            "availability_topic": availability_topic,
-            "payload_available": "ON",
-            "payload_not_available": "OFF",
-            "device": device_info_payload,
+            **common,
+            **platform_extras,
+            **optional,
+            **expiry,
         }
 
-        if platform == "binary_sensor":
-            payload["payload_on"] = "true"
-            payload["payload_off"] = "false"
-
-        if definition.unit:
-            payload["unit_of_measurement"] = definition.unit
-        if definition.device_class:
-            payload["device_class"] = definition.device_class
-        if definition.state_class:
-            payload["state_class"] = definition.state_class
-        if definition.icon:
-            payload["icon"] = definition.icon
-        if refresh_every > 0:
-            payload["expire_after"] = int(refresh_every * 2.2)
-
         messages.append(
             PublishMessage(
-                topic=discovery_topic, payload=json.dumps(payload), retain=True, qos=1
+                topic=discovery_topic, payload=orjson.dumps(payload), retain=True, qos=1
             )
         )
 
-    return messages
+    return tuple(messages)
 
 
 def build_image_discovery_message(config: BridgeConfig, device: str) -> PublishMessage:
@@ -118,5 +172,5 @@ def build_image_discovery_message(config: BridgeConfig, device: str) -> PublishM
     }
 
     return PublishMessage(
-        topic=discovery_topic, payload=json.dumps(payload), retain=True, qos=1
+        topic=discovery_topic, payload=orjson.dumps(payload), retain=True, qos=1
     )
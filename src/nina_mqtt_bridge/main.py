@@ -6,6 +6,7 @@ import argparse
 import logging
 import signal
 import sys
+import threading
 from pathlib import Path
 
 from .bridge import Bridge
@@ -49,19 +50,24 @@ def main(argv: list[str] | None = None) -> int:
     config = load_config_from_cli(args.config)
     bridge = Bridge(config)
 
+    stop_event = threading.Event()
+
+    def _shutdown(_signum: int, _frame: object) -> None:
+        bridge.stop()
+        stop_event.set()
+
     stop_signals = (signal.SIGINT, signal.SIGTERM)
     for sig in stop_signals:
-        signal.signal(sig, lambda _s, _f: bridge.stop())
+        signal.signal(sig, _shutdown)
 
     bridge.start()
-    try:
-        signal.pause()
-    except AttributeError:
-        # Windows compatibility: fallback to manual loop
-        import time
-
-        while True:
-            time.sleep(1)
+    if sys.platform == "win32":
+        # Lock waits cannot be interrupted by Ctrl+C on Windows, so wake
+        # periodically to let the signal handler run.
+        while not stop_event.wait(timeout=1):
+            pass
+    else:
+        stop_event.wait()
     return 0
 
 
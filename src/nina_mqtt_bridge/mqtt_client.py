@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional, Sequence, Tuple
 
+import orjson
 import paho.mqtt.client as mqtt
 
 from .config import MQTTConfig
@@ -14,7 +14,7 @@ from .config import MQTTConfig
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PublishMessage:
     """Container for outbound MQTT messages."""
 
@@ -53,12 +53,13 @@ class MQTTClient:
         self._client.disconnect()
 
     def publish(self, message: PublishMessage) -> None:
-        logger.debug(
-            "Publishing to %s retain=%s qos=%s",
-            message.topic,
-            message.retain,
-            message.qos,
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Publishing to %s retain=%s qos=%s",
+                message.topic,
+                message.retain,
+                message.qos,
+            )
         result = self._client.publish(
             message.topic,
             payload=message.payload,
@@ -70,12 +71,74 @@ class MQTTClient:
                 "MQTT publish failed for %s: rc=%s", message.topic, result.rc
             )
 
+    def publish_many(self, messages: Sequence[PublishMessage]) -> None:
+        """
+        Publish a batch of messages back-to-back.
+
+        Retained messages for the same topic are coalesced so only the newest
+        payload is sent; earlier ones would be superseded on the broker anyway.
+        """
+
+        latest_retained: Dict[str, int] = {}
+        for index, message in enumerate(messages):
+            if message.retain:
+                latest_retained[message.topic] = index
+
+        client_publish = self._client.publish
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for index, message in enumerate(messages):
+            if message.retain and latest_retained[message.topic] != index:
+                continue
+            if debug:
+                logger.debug(
+                    "Publishing to %s retain=%s qos=%s",
+                    message.topic,
+                    message.retain,
+                    message.qos,
+                )
+            try:
+                result = client_publish(
+                    message.topic, message.payload, message.qos, message.retain
+                )
+            except Exception:
+                logger.exception("MQTT publish failed for %s", message.topic)
+                continue
+            if result.rc != mqtt.MQTT_ERR_SUCCESS:
+                logger.warning(
+                    "MQTT publish failed for %s: rc=%s", message.topic, result.rc
+                )
+
+    def publish_retained_bulk(
+        self, messages: Sequence[Tuple[str, str]], timeout: float = 5.0
+    ) -> None:
+        """
+        Synchronously publish retained QoS 1 messages, bypassing any queue.
+
+        Waits for the broker to acknowledge the last message so callers can
+        disconnect immediately afterwards (used on shutdown).
+        """
+
+        info: Optional[mqtt.MQTTMessageInfo] = None
+        for topic, payload in messages:
+            info = self._client.publish(topic, payload=payload, qos=1, retain=True)
+            if info.rc != mqtt.MQTT_ERR_SUCCESS:
+                logger.warning("MQTT publish failed for %s: rc=%s", topic, info.rc)
+        if info is None:
+            return
+        try:
+            info.wait_for_publish(timeout=timeout)
+        except (RuntimeError, ValueError) as exc:
+            logger.warning("Retained bulk publish failed: %s", exc)
+            return
+        if not info.is_published():
+            logger.warning("Retained bulk publish not acknowledged in %ss", timeout)
+
     def publish_json(
         self, topic: str, payload: dict, retain: bool = False, qos: int = 0
     ) -> None:
         self.publish(
             PublishMessage(
-                topic=topic, payload=json.dumps(payload), retain=retain, qos=qos
+                topic=topic, payload=orjson.dumps(payload), retain=retain, qos=qos
             )
         )
 
@@ -4,13 +4,31 @@ from __future__ import annotations
 
 import base64
 import logging
-from typing import Any, Dict, Optional
+import re
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Tuple
 from urllib.parse import quote
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# All polling goes to a single NINA host, so one pool sized for the scheduler
+# threads is enough to keep connections alive between polls.
+HTTP_POOL_MAXSIZE = 16
+
+# Longest Retry-After delay honoured before retrying; polls run on a shared
+# scheduler thread, so a long server-requested pause would stall every device.
+RETRY_AFTER_MAX = 2.0
+
+# Read size for streamed downloads; a multiple of 3 so each chunk base64
+# encodes without padding.
+STREAM_CHUNK_SIZE = 57 * 1024
+
 # Mappings derived from the published Advanced API OpenAPI spec.
 DEVICE_ENDPOINTS = {
     "application": "/version",
@@ -35,16 +53,111 @@ IMAGE_ENDPOINTS = {
     "screenshot": "/application/screenshot",
 }
 
+# Command actions that map straight onto a parameterless endpoint.
+_SEQUENCE_ACTIONS = {
+    "stop": "/sequence/stop",
+    "reset": "/sequence/reset",
+    "restart": "/sequence/reset",
+}
+_MOUNT_ACTIONS = {
+    "home": "/equipment/mount/home",
+    "park": "/equipment/mount/park",
+    "unpark": "/equipment/mount/unpark",
+}
+_TRACKING_ACTIONS = frozenset({"tracking", "track", "set_tracking"})
+
+# Path segments made only of these characters are left unchanged by quote().
+_URL_SAFE_SEGMENT = re.compile(r"[A-Za-z0-9._-]+").fullmatch
+
+# Named tracking modes accepted by mount commands, mapped to NINA's 0-4 values.
+_TRACKING_MODES = MappingProxyType(
+    {
+        "sidereal": 0,
+        "siderial": 0,
+        "lunar": 1,
+        "moon": 1,
+        "solar": 2,
+        "sun": 2,
+        "king": 3,
+        "stop": 4,
+        "stopped": 4,
+        "off": 4,
+    }
+)
+
+# Responses that do not change while NINA is running are reused for this many
+# seconds without a round trip.
+RESPONSE_TTLS = {
+    "/version": 3600.0,
+}
+
+# Parameterless polling endpoints whose responses are cached and revalidated
+# with If-None-Match when NINA supplies an ETag. Commands are never cached.
+_CACHEABLE_PATHS = frozenset(DEVICE_ENDPOINTS.values()) | {
+    "/application-start",
+    "/livestack/image/available",
+}
+
+# Every fixed path the client requests, so their full URLs can be built once.
+_FIXED_PATHS = _CACHEABLE_PATHS.union(
+    _SEQUENCE_ACTIONS.values(),
+    _MOUNT_ACTIONS.values(),
+    (path for path in IMAGE_ENDPOINTS.values() if "{" not in path),
+) | {"/sequence/start", "/equipment/mount/tracking"}
+
+
+class _BoundedRetry(Retry):
+    """Retry policy that caps server-requested Retry-After delays."""
+
+    def get_retry_after(self, response: Any) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, RETRY_AFTER_MAX)
+
 
 class NINAClient:
     """Lightweight client for interacting with the NINA Advanced API."""
 
     def __init__(self, base_url: str) -> None:
         self._base_url = base_url.rstrip("/")
+        # Polling session: read-only requests, retried on transient failures.
         self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=_BoundedRetry(
+                total=2,
+                # One reconnect attempt at most: polls share a scheduler
+                # thread, so an unreachable host must not cost three timeouts.
+                connect=1,
+                # A timed-out read is not repeated; the next poll will retry.
+                read=False,
+                backoff_factor=0.2,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Commands are GETs too, but NINA may already have acted on one that
+        # failed, so they go through a session that never retries.
+        self._command_session = requests.Session()
+        # Fully qualified URLs for every fixed path, built once.
+        self._urls: Dict[str, str] = {
+            path: self._base_url + path for path in _FIXED_PATHS
+        }
+        # Last ((target, filter), path) resolved for livestack polls.
+        self._livestack_path: Optional[Tuple[Tuple[Any, Any], str]] = None
+        # path -> (fetched at, ETag, parsed body)
+        self._response_cache: Dict[str, Tuple[float, str, Any]] = {}
 
     def close(self) -> None:
+        self._response_cache.clear()
         self._session.close()
+        self._command_session.close()
 
     def fetch_device_status(self, device: str) -> Dict[str, Any]:
         """Pull the status block for a specific device type."""
@@ -87,8 +200,9 @@ class NINAClient:
                     "/application/screenshot",
                     params={"stream": "true"},
                 )
-        except requests.HTTPError:
-            logger.exception("Image fetch failed for %s", image_type)
+        except requests.HTTPError as exc:
+            # Retries already happened in the adapter; this is the final status.
+            logger.warning("Image fetch failed for %s: %s", image_type, exc)
             return None
 
         raise ValueError(f"Unsupported image type: {image_type}")
@@ -116,28 +230,25 @@ class NINAClient:
     def _handle_sequence_command(
         self, action: str, payload: Dict[str, Any]
     ) -> Dict[str, Any]:
+        path = _SEQUENCE_ACTIONS.get(action)
+        if path is not None:
+            return self._command_json(path)
         if action == "start":
-            params = {"skipValidation": payload.get("skipValidation", False)}
-            return self._get_json("/sequence/start", params=params)
-        if action == "stop":
-            return self._get_json("/sequence/stop")
-        if action in ("reset", "restart"):
-            return self._get_json("/sequence/reset")
+            skip = _query_bool(payload.get("skipValidation", False))
+            params = {"skipValidation": skip}
+            return self._command_json("/sequence/start", params=params)
         raise ValueError(f"Unsupported sequence action: {action}")
 
     def _handle_mount_command(
         self, action: str, payload: Dict[str, Any]
     ) -> Dict[str, Any]:
-        if action == "home":
-            return self._get_json("/equipment/mount/home")
-        if action == "park":
-            return self._get_json("/equipment/mount/park")
-        if action == "unpark":
-            return self._get_json("/equipment/mount/unpark")
-        if action in ("tracking", "track", "set_tracking"):
+        path = _MOUNT_ACTIONS.get(action)
+        if path is not None:
+            return self._command_json(path)
+        if action in _TRACKING_ACTIONS:
             mode_value = self._parse_tracking_mode(payload.get("mode"))
-            return self._get_json(
-                "/equipment/mount/tracking", params={"mode": mode_value}
+            return self._command_json(
+                "/equipment/mount/tracking", params={"mode": str(mode_value)}
             )
         raise ValueError(f"Unsupported mount action: {action}")
 
@@ -147,9 +258,19 @@ class NINAClient:
         for key in ("resize", "quality", "size", "scale"):
             if key in payload:
                 params[key] = payload[key]
-        image_bytes = self._get_bytes("/application/screenshot", params=params)
-        encoded = base64.b64encode(image_bytes).decode("ascii")
-        return {"image_base64": encoded}
+        # Encode while streaming so the raw image is never held in full.
+        encoded = bytearray()
+        pending = b""
+        for chunk in self._iter_bytes(
+            self._command_session, "/application/screenshot", params=params
+        ):
+            if pending:
+                chunk = pending + chunk
+            aligned = len(chunk) - len(chunk) % 3
+            encoded += base64.b64encode(memoryview(chunk)[:aligned])
+            pending = chunk[aligned:]
+        encoded += base64.b64encode(pending)
+        return {"image_base64": encoded.decode("ascii")}
 
     def _parse_tracking_mode(self, mode: Any) -> int:
         if isinstance(mode, int):
@@ -157,22 +278,13 @@ class NINAClient:
                 return mode
         if isinstance(mode, str):
             normalized = mode.strip().lower()
-            mapping = {
-                "sidereal": 0,
-                "siderial": 0,
-                "lunar": 1,
-                "moon": 1,
-                "solar": 2,
-                "sun": 2,
-                "king": 3,
-                "stop": 4,
-                "stopped": 4,
-                "off": 4,
-            }
-            if normalized in mapping:
-                return mapping[normalized]
-            if normalized.isdigit():
+            if normalized in _TRACKING_MODES:
+                return _TRACKING_MODES[normalized]
+            try:
                 numeric = int(normalized)
+            except ValueError:
+                pass
+            else:
                 if 0 <= numeric <= 4:
                     return numeric
         raise ValueError(
@@ -194,32 +306,92 @@ class NINAClient:
             logger.debug("Livestack entry missing target or filter: %s", latest)
             return None
 
-        path = f"/livestack/image/{quote(str(target))}/{quote(str(filter_name))}"
+        key = (target, filter_name)
+        if self._livestack_path is not None and self._livestack_path[0] == key:
+            path = self._livestack_path[1]
+        else:
+            path = f"/livestack/image/{_quote_segment(target)}/{_quote_segment(filter_name)}"
+            self._livestack_path = (key, path)
         return self._get_bytes(path, params={"stream": "true"})
 
+    def _url(self, path: str) -> str:
+        return self._urls.get(path) or self._base_url + path
+
     def _get_json(
         self, path: str, params: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        response = self._session.get(
-            f"{self._base_url}{path}", params=params, timeout=10
-        )
+        cacheable = params is None and path in _CACHEABLE_PATHS
+        cached = self._response_cache.get(path) if cacheable else None
+        headers = None
+        if cached is not None:
+            fetched_at, etag, body = cached
+            if time.monotonic() - fetched_at < RESPONSE_TTLS.get(path, 0.0):
+                return body
+            if etag:
+                headers = {"If-None-Match": etag}
+
+        try:
+            response = self._session.get(
+                self._url(path), params=params, headers=headers, timeout=10
+            )
+        except requests.ConnectionError:
+            # NINA may have restarted; don't serve anything fetched before.
+            self._response_cache.clear()
+            raise
+        if cached is not None and response.status_code == 304:
+            self._response_cache[path] = (time.monotonic(), cached[1], cached[2])
+            return cached[2]
         response.raise_for_status()
-        return response.json()
+        body = orjson.loads(response.content)
+        if cacheable:
+            etag = response.headers.get("ETag", "")
+            if etag or path in RESPONSE_TTLS:
+                self._response_cache[path] = (time.monotonic(), etag, body)
+        return body
+
+    def _command_json(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        response = self._command_session.get(self._url(path), params=params, timeout=10)
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     def _get_bytes(self, path: str, params: Optional[Dict[str, Any]] = None) -> bytes:
-        response = self._session.get(
-            f"{self._base_url}{path}", params=params, timeout=10
-        )
+        response = self._session.get(self._url(path), params=params, timeout=10)
         response.raise_for_status()
         return response.content
 
+    def _iter_bytes(
+        self,
+        session: requests.Session,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[bytes]:
+        with session.get(
+            self._url(path), params=params, timeout=10, stream=True
+        ) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+
     def _post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         response = self._session.post(
-            f"{self._base_url}{path}",
+            self._url(path),
             json=payload,
             timeout=10,
         )
         response.raise_for_status()
         if response.content:
-            return response.json()
+            return orjson.loads(response.content)
         return {}
+
+
+def _quote_segment(value: Any) -> str:
+    text = str(value)
+    return text if _URL_SAFE_SEGMENT(text) else quote(text)
+
+
+def _query_bool(value: Any) -> str:
+    """Render a flag the way NINA expects it in a query string."""
+    if isinstance(value, str):
+        value = value.strip().lower() in ("true", "1", "yes", "on")
+    return "true" if value else "false"
@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Callable, List
+from typing import Callable, Deque, List, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ScheduledTask:
     """A recurring task with a fixed interval in seconds."""
 
@@ -27,18 +30,26 @@ class Scheduler:
 
     This is intentionally minimal; each task is expected to be fast and
     non-blocking. Longer-running work should hand off to dedicated threads.
+    Tasks are kept in a heap ordered by next run time so each wakeup only
+    touches the task that is due. The heap is owned by the worker thread;
+    new tasks are handed over through a deque, so the loop takes no lock.
+    The worker sleeps until the next task is due or it is woken by add_task
+    or stop.
     """
 
     def __init__(self) -> None:
-        self._tasks: List[ScheduledTask] = []
-        self._lock = threading.Lock()
+        # (next_run, insertion order, task); the counter breaks ties.
+        self._heap: List[Tuple[float, int, ScheduledTask]] = []
+        self._counter = itertools.count()
+        self._pending: Deque[ScheduledTask] = deque()
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
         self._thread: threading.Thread | None = None
 
     def add_task(self, task: ScheduledTask) -> None:
-        with self._lock:
-            self._tasks.append(task)
-            logger.debug("Scheduled task added: %s every %ss", task.name, task.interval)
+        self._pending.append(task)
+        self._wake_event.set()
+        logger.debug("Scheduled task added: %s every %ss", task.name, task.interval)
 
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -49,23 +60,39 @@ class Scheduler:
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._wake_event.set()
         if self._thread:
             self._thread.join(timeout=5)
         logger.info("Scheduler stopped")
 
     def _run(self) -> None:
+        heap = self._heap
+        pending = self._pending
+        wake = self._wake_event
+        # Clock read once per wakeup or task run and reused until the next one.
+        now = time.monotonic()
         while not self._stop_event.is_set():
-            now = time.monotonic()
-            next_delay = 1.0
-            with self._lock:
-                for task in self._tasks:
-                    due_in = (task.last_run + task.interval) - now
-                    if due_in <= 0:
-                        self._safe_run(task)
-                        task.last_run = time.monotonic()
-                        due_in = task.interval
-                    next_delay = min(next_delay, max(due_in, 0.05))
-            self._stop_event.wait(timeout=next_delay)
+            # Cleared before draining so a task added meanwhile re-sets it.
+            wake.clear()
+            while pending:
+                heapq.heappush(heap, (now, next(self._counter), pending.popleft()))
+            if not heap:
+                wake.wait()
+                now = time.monotonic()
+                continue
+
+            next_run, _, task = heap[0]
+            delay = next_run - now
+            if delay > 0:
+                wake.wait(timeout=delay)
+                now = time.monotonic()
+                continue
+
+            heapq.heappop(heap)
+            self._safe_run(task)
+            # Measured after the run so a slow task still waits a full interval.
+            now = task.last_run = time.monotonic()
+            heapq.heappush(heap, (now + task.interval, next(self._counter), task))
 
     def _safe_run(self, task: ScheduledTask) -> None:
         try: